@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from datetime import datetime
 from backend.config import settings
-from backend.lib.database import check_database_health
+from backend.lib.database import TESTING, check_database_health, engine
 from backend.app.scout.ml_predictor import TORCH_AVAILABLE
 
 router = APIRouter()
@@ -11,20 +11,10 @@ router = APIRouter()
 async def get_system_info():
     """Get system configuration and status"""
 
-    # Database status - Multi-database setup
-    databases = check_database_health() if engines else {}
-
-    # Overall status
-    if databases:
-        all_connected = all(status == "connected" for status in databases.values())
-        database_status = "connected" if all_connected else "partial"
-    else:
-        database_status = "disconnected"
-
-    # Determine database type (contract expected by tests)
-    # - SQLite Multi-Database when databases are initialized
-    # - In-Memory when nothing is initialized (CI/testing)
-    db_type = "SQLite Multi-Database" if databases else "In-Memory"
+    # Database status (single engine: PostgreSQL, in-memory SQLite under TESTING)
+    health = check_database_health()
+    database_status = "connected" if health["status"] == "connected" else "error"
+    db_type = "In-Memory" if TESTING else "PostgreSQL"
 
     return {
         "server": {
@@ -38,24 +28,7 @@ async def get_system_info():
         "database": {
             "status": database_status,
             "type": db_type,
-            "databases": databases,
-            "urls": {
-                "trading": (
-                    settings.TRADING_DATABASE_URL.split("///")[1]
-                    if "///" in settings.TRADING_DATABASE_URL
-                    else settings.TRADING_DATABASE_URL
-                ),
-                "market": (
-                    settings.MARKET_DATABASE_URL.split("///")[1]
-                    if "///" in settings.MARKET_DATABASE_URL
-                    else settings.MARKET_DATABASE_URL
-                ),
-                "analytics": (
-                    settings.ANALYTICS_DATABASE_URL.split("///")[1]
-                    if "///" in settings.ANALYTICS_DATABASE_URL
-                    else settings.ANALYTICS_DATABASE_URL
-                ),
-            },
+            "url": engine.url.render_as_string(hide_password=True),
         },
         "ml_features": {
             "technical_analysis": True,
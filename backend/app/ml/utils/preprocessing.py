@@ -195,29 +195,49 @@ class DataPreprocessor:
         return data + noise
 
 
-def normalize_ohlcv(ohlcv: np.ndarray) -> np.ndarray:
+def normalize_ohlcv(
+    ohlcv: np.ndarray,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     Normalize OHLCV data to [0, 1] range.
     
     Args:
         ohlcv: OHLCV array with shape (sequence_length, 5)
+        out: Floating-point array to write the result into; pass ``ohlcv``
+            itself to normalize in place. A float copy is allocated when
+            omitted.
     
     Returns:
-        Normalized OHLCV array
-    """
-    ohlcv_normalized = ohlcv.copy()
+        Normalized OHLCV array (``out`` when given)
     
-    # Find min and max for normalization
+    Raises:
+        TypeError: If ``out`` is not a floating-point array
+    """
+    # Find min and max for normalization (before out, maybe ohlcv, is written)
     min_val = ohlcv[:, [1, 2, 3]].min()  # Low values
     max_val = ohlcv[:, [0, 1, 2]].max()  # High values
+    volume_max = ohlcv[:, 4].max() if ohlcv.shape[1] > 4 else 0
+    
+    if out is None:
+        # Integer input gets a float64 result; float input keeps its dtype
+        out = ohlcv.astype(
+            ohlcv.dtype if np.issubdtype(ohlcv.dtype, np.floating) else np.float64
+        )
+    elif not np.issubdtype(out.dtype, np.floating):
+        # Writing [0, 1] values into an integer array would truncate them
+        raise TypeError(f"out must be a floating-point array, got {out.dtype}")
+    elif out is not ohlcv:
+        np.copyto(out, ohlcv)
     
-    # Normalize price columns (OHLC)
-    ohlcv_normalized[:, :4] = (ohlcv[:, :4] - min_val) / (max_val - min_val + 1e-8)
+    # Normalize price columns (OHLC) through a view, no temporaries
+    prices = out[:, :4]
+    np.subtract(prices, min_val, out=prices)
+    np.divide(prices, max_val - min_val + 1e-8, out=prices)
     
     # Normalize volume separately
-    if ohlcv.shape[1] > 4:
-        volume_max = ohlcv[:, 4].max()
-        if volume_max > 0:
-            ohlcv_normalized[:, 4] = ohlcv[:, 4] / volume_max
+    if volume_max > 0:
+        volume = out[:, 4]
+        np.divide(volume, volume_max, out=volume)
     
-    return ohlcv_normalized
+    return out
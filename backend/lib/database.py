@@ -1,9 +1,10 @@
 import os
 import logging
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import create_engine, event, text, inspect
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
-from backend.config import settings
+from sqlalchemy.pool import StaticPool
+from backend.config import settings, _truthy
 
 logger = logging.getLogger(__name__)
 
@@ -14,22 +15,47 @@ def get_database_url():
     return os.environ.get("DATABASE_URL") or settings.DATABASE_URL
 
 
-DATABASE_URL = get_database_url()
-print(f"USO DATABASE_URL: {DATABASE_URL}")
-if not DATABASE_URL or not DATABASE_URL.startswith("postgresql"):
-    raise RuntimeError(
-        f"Devi settare una variabile PostgreSQL DATABASE_URL valida! (ora: {DATABASE_URL})"
+TESTING = _truthy(os.environ.get("TESTING"))
+
+if TESTING:
+    # Test suite: SQLite in-process, una sola connessione condivisa (StaticPool)
+    # così ogni get_db() vede lo stesso DB in memoria, senza rete né disco
+    DATABASE_URL = "sqlite://"
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        echo=False,
     )
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False,
-    pool_size=10,
-    max_overflow=20,
-    pool_timeout=60,
-    pool_recycle=1800,
-)
+    # pysqlite gestisce le transazioni a modo suo e rompe i SAVEPOINT: il BEGIN
+    # lo emette SQLAlchemy, così il rollback esterno della fixture `db` annulla
+    # anche ciò che i service hanno committato (ricetta della doc SQLAlchemy)
+    @event.listens_for(engine, "connect")
+    def _sqlite_disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _sqlite_emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+else:
+    DATABASE_URL = get_database_url()
+    print(f"USO DATABASE_URL: {DATABASE_URL}")
+    if not DATABASE_URL or not DATABASE_URL.startswith("postgresql"):
+        raise RuntimeError(
+            f"Devi settare una variabile PostgreSQL DATABASE_URL valida! (ora: {DATABASE_URL})"
+        )
+
+    engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        echo=False,
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=60,
+        pool_recycle=1800,
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
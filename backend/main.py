@@ -14,7 +14,7 @@ from backend.app.routers.ml_training import router as ml_training_router
 from backend.app.routers.scout import router as scout_router
 from backend.app.routers.websocket import router as websocket_router
 
-from backend.config import settings
+from backend.config import settings, _truthy
 from backend.services.realtime_service import realtime_service
 from backend.services.websocket_manager import websocket_manager
 from backend.app.scout.ml_predictor import TORCH_AVAILABLE
@@ -33,6 +33,10 @@ async def lifespan(app: FastAPI):
         or os.environ.get("RUN_MAIN") == "true"
     )
 
+    # The test suite shares one app (and its service singletons) across all
+    # tests: startup must not leave state or background tasks behind there
+    testing = _truthy(os.environ.get("TESTING"))
+
     # Initialize database
     from backend.lib.database import (
         init_database,
@@ -45,7 +49,8 @@ async def lifespan(app: FastAPI):
     db_initialized = init_database()
     if db_initialized:
         create_tables()
-        paper_trading_service.set_database(True)
+        if not testing:
+            paper_trading_service.set_database(True)
         db_health = check_database_health()
         print("[Startup] ✓ Multi-Database initialized successfully:")
         for db_name, status in db_health.items():
@@ -133,16 +138,22 @@ EXAMPLES:
     from backend.services.order_monitoring_service import order_monitoring_service
     from backend.services.trailing_stop_service import trailing_stop_service
 
-    order_monitoring_service.set_websocket_manager(websocket_manager)
-    realtime_service.set_order_monitoring_service(order_monitoring_service)
+    # Broadcasts schedule tasks on the running loop, which synchronous tests
+    # driving the monitoring service directly do not have
+    if not testing:
+        order_monitoring_service.set_websocket_manager(websocket_manager)
+        realtime_service.set_order_monitoring_service(order_monitoring_service)
 
     # Start real-time service
-    print("[Startup] Initializing real-time data service...")
-    await realtime_service.start()
-    print("[Startup] Real-time service ready")
+    if testing:
+        print("[Startup] TESTING mode - real-time service not started")
+    else:
+        print("[Startup] Initializing real-time data service...")
+        await realtime_service.start()
+        print("[Startup] Real-time service ready")
 
     # Start trailing stop service if database is enabled
-    if paper_trading_service.use_database:
+    if paper_trading_service.use_database and not testing:
         await trailing_stop_service.start()
         print("[Startup] Trailing stop service started")
 
@@ -161,6 +172,8 @@ EXAMPLES:
     await trailing_stop_service.stop()
     print("[Shutdown] Trailing stop service stopped")
 
+    await websocket_manager.close()
+
     print("=" * 60)
 
 
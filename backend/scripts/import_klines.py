@@ -146,7 +146,7 @@ def _upsert_metadata(
     interval: str,
     error_code: str | None = None,
     error_message: str | None = None,
-) -> None:
+) -> Any:
     """
     Update metadata based on actual DB state.
 
@@ -154,6 +154,9 @@ def _upsert_metadata(
     - 'complete': DB has candles and no error
     - 'error': DB has 0 candles or error occurred
     - 'partial': DB has some candles but error occurred during sync
+
+    Returns the resulting metadata row (sync_status, error_code, error_message,
+    total_candles, last_attempt_at, last_success_at) via RETURNING.
     """
     now = _utc_now()
 
@@ -208,7 +211,7 @@ def _upsert_metadata(
     # Build dynamic SQL based on whether we're clearing or setting errors
     if error_code:
         # Set error fields
-        db.execute(
+        return db.execute(
             text(
                 """
                 INSERT INTO candlestick_metadata (
@@ -234,13 +237,15 @@ def _upsert_metadata(
                     error_message = EXCLUDED.error_message,
                     last_attempt_at = EXCLUDED.last_attempt_at,
                     updated_at = :now
+                RETURNING sync_status, error_code, error_message, total_candles,
+                    last_attempt_at, last_success_at
             """
             ),
             params,
-        )
+        ).fetchone()
     else:
         # Clear error fields and set last_success_at
-        db.execute(
+        return db.execute(
             text(
                 """
                 INSERT INTO candlestick_metadata (
@@ -267,10 +272,12 @@ def _upsert_metadata(
                     last_attempt_at = EXCLUDED.last_attempt_at,
                     last_success_at = EXCLUDED.last_success_at,
                     updated_at = :now
+                RETURNING sync_status, error_code, error_message, total_candles,
+                    last_attempt_at, last_success_at
             """
             ),
             params,
-        )
+        ).fetchone()
 
 
 def _set_metadata_status(
@@ -283,64 +290,63 @@ def _set_metadata_status(
     """Best-effort metadata status update."""
     now = _utc_now()
 
-
-db_gen = get_db()
-db = next(db_gen)
-try:
-    if error_code:
-        db.execute(
-            text(
-                """
-                INSERT INTO candlestick_metadata (
-                    symbol, interval, sync_status, last_sync,
-                    error_code, error_message, last_attempt_at
-                )
-                VALUES (
-                    :symbol, :interval, :status, :now,
-                    :error_code, :error_message, :now
-                )
-                ON CONFLICT (symbol, interval)
-                DO UPDATE SET
-                    sync_status = :status,
-                    last_sync = :now,
-                    error_code = :error_code,
-                    error_message = :error_message,
-                    last_attempt_at = :now,
-                    updated_at = :now
-                """
-            ),
-            {
-                "symbol": symbol,
-                "interval": interval,
-                "status": status,
-                "error_code": error_code,
-                "error_message": error_message,
-                "now": now,
-            },
-        )
-    else:
-        db.execute(
-            text(
-                """
-                INSERT INTO candlestick_metadata (
-                    symbol, interval, sync_status, last_sync, last_attempt_at
-                )
-                VALUES (:symbol, :interval, :status, :now, :now)
-                ON CONFLICT (symbol, interval)
-                DO UPDATE SET
-                    sync_status = :status,
-                    last_sync = :now,
-                    last_attempt_at = :now,
-                    updated_at = :now
-                """
-            ),
-            {"symbol": symbol, "interval": interval, "status": status, "now": now},
-        )
-finally:
+    db_gen = get_db()
+    db = next(db_gen)
     try:
-        next(db_gen)
-    except StopIteration:
-        pass
+        if error_code:
+            db.execute(
+                text(
+                    """
+                    INSERT INTO candlestick_metadata (
+                        symbol, interval, sync_status, last_sync,
+                        error_code, error_message, last_attempt_at
+                    )
+                    VALUES (
+                        :symbol, :interval, :status, :now,
+                        :error_code, :error_message, :now
+                    )
+                    ON CONFLICT (symbol, interval)
+                    DO UPDATE SET
+                        sync_status = :status,
+                        last_sync = :now,
+                        error_code = :error_code,
+                        error_message = :error_message,
+                        last_attempt_at = :now,
+                        updated_at = :now
+                    """
+                ),
+                {
+                    "symbol": symbol,
+                    "interval": interval,
+                    "status": status,
+                    "error_code": error_code,
+                    "error_message": error_message,
+                    "now": now,
+                },
+            )
+        else:
+            db.execute(
+                text(
+                    """
+                    INSERT INTO candlestick_metadata (
+                        symbol, interval, sync_status, last_sync, last_attempt_at
+                    )
+                    VALUES (:symbol, :interval, :status, :now, :now)
+                    ON CONFLICT (symbol, interval)
+                    DO UPDATE SET
+                        sync_status = :status,
+                        last_sync = :now,
+                        last_attempt_at = :now,
+                        updated_at = :now
+                    """
+                ),
+                {"symbol": symbol, "interval": interval, "status": status, "now": now},
+            )
+    finally:
+        try:
+            next(db_gen)
+        except StopIteration:
+            pass
 
 
 def import_symbol_interval(
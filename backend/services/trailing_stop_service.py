@@ -2,6 +2,11 @@ import asyncio
 import logging
 from sqlalchemy.orm import Session
 
+from backend.lib.database import get_db
+from backend.models.position import Position, PositionStatus, PositionSide
+from backend.services.binance_service import binance_service
+from backend.services.paper_trading_service import paper_trading_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,8 +52,6 @@ class TrailingStopService:
 
             try:
                 async with self._loop_lock:
-                    from backend.lib.database import get_db
-
                     db_gen = get_db()
                     db = next(db_gen)
                     try:
@@ -76,10 +79,6 @@ class TrailingStopService:
 
     async def _check_trailing_stops(self, db: Session) -> int:
         """Check all positions with trailing stops. Returns processed count."""
-        from backend.models.position import Position, PositionStatus, PositionSide
-        from backend.services.binance_service import binance_service
-        from backend.services.paper_trading_service import paper_trading_service
-
         positions = (
             db.query(Position)
             .filter(
@@ -92,76 +91,100 @@ class TrailingStopService:
         if not positions:
             return 0
 
+        # raggruppa per simbolo: un solo fetch prezzo per simbolo
+        positions_by_symbol = {}
+        for position in positions:
+            positions_by_symbol.setdefault(position.symbol, []).append(position)
+
         updated_any = False
 
-        for position in positions:
+        for symbol, symbol_positions in positions_by_symbol.items():
             try:
-                # ✅ evita blocco event-loop: chiama funzione sync in thread
-                klines = await asyncio.to_thread(
-                    binance_service.get_klines_data,
-                    symbol=position.symbol,
-                    interval="1m",
-                    limit=1,
-                )
+                current_price = await self._get_current_price(symbol)
+            except Exception as e:
+                logger.error(f"Error fetching price for {symbol}: {e}")
+                continue
+
+            if current_price is None:
+                continue
+
+            for position in symbol_positions:
+                try:
+                    if self._apply_trailing_stop(position, current_price, db):
+                        updated_any = True
+                except Exception as e:
+                    logger.error(
+                        f"Error processing trailing stop for {position.id}: {e}"
+                    )
+
+        # ✅ un commit solo a fine giro (se abbiamo aggiornato qualcosa)
+        if updated_any:
+            try:
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
 
-                if klines is None or (hasattr(klines, "empty") and klines.empty):
-                    continue
+        return len(positions)
 
-                klines_list = klines.to_dict("records")
-                if not klines_list:
-                    continue
+    async def _get_current_price(self, symbol: str):
+        """Fetch the latest 1m close for a symbol, or None if unavailable."""
+        # ✅ evita blocco event-loop: chiama funzione sync in thread
+        klines = await asyncio.to_thread(
+            binance_service.get_klines_data,
+            symbol=symbol,
+            interval="1m",
+            limit=1,
+        )
 
-                current_price = float(klines_list[0]["close"])
+        if klines is None or (hasattr(klines, "empty") and klines.empty):
+            return None
 
-                # Activation check
-                if position.trailing_stop_activation_price:
-                    if position.side == PositionSide.BUY:
-                        if current_price < position.trailing_stop_activation_price:
-                            continue
-                    else:
-                        if current_price > position.trailing_stop_activation_price:
-                            continue
+        klines_list = klines.to_dict("records")
+        if not klines_list:
+            return None
 
-                distance_pct = position.trailing_stop_distance / 100
+        return float(klines_list[0]["close"])
 
-                if position.side == PositionSide.BUY:
-                    new_stop_loss = current_price * (1 - distance_pct)
+    def _apply_trailing_stop(
+        self, position: Position, current_price: float, db: Session
+    ) -> bool:
+        """Update/trigger the trailing stop of one position. Returns True if updated."""
+        # Activation check
+        if position.trailing_stop_activation_price:
+            if position.side == PositionSide.BUY:
+                if current_price < position.trailing_stop_activation_price:
+                    return False
+            else:
+                if current_price > position.trailing_stop_activation_price:
+                    return False
 
-                    if not position.stop_loss or new_stop_loss > position.stop_loss:
-                        position.stop_loss = new_stop_loss
-                        updated_any = True
+        distance_pct = position.trailing_stop_distance / 100
+        updated = False
 
-                    if position.stop_loss and current_price <= position.stop_loss:
-                        logger.info(f"Trailing stop triggered for {position.symbol}")
-                        paper_trading_service.close_position(
-                            position.id, current_price, db
-                        )
+        if position.side == PositionSide.BUY:
+            new_stop_loss = current_price * (1 - distance_pct)
 
-                else:  # SELL
-                    new_stop_loss = current_price * (1 + distance_pct)
+            if not position.stop_loss or new_stop_loss > position.stop_loss:
+                position.stop_loss = new_stop_loss
+                updated = True
 
-                    if not position.stop_loss or new_stop_loss < position.stop_loss:
-                        position.stop_loss = new_stop_loss
-                        updated_any = True
+            if position.stop_loss and current_price <= position.stop_loss:
+                logger.info(f"Trailing stop triggered for {position.symbol}")
+                paper_trading_service.close_position(position.id, current_price, db)
 
-                    if position.stop_loss and current_price >= position.stop_loss:
-                        logger.info(f"Trailing stop triggered for {position.symbol}")
-                        paper_trading_service.close_position(
-                            position.id, current_price, db
-                        )
+        else:  # SELL
+            new_stop_loss = current_price * (1 + distance_pct)
 
-            except Exception as e:
-                logger.error(f"Error processing trailing stop for {position.id}: {e}")
+            if not position.stop_loss or new_stop_loss < position.stop_loss:
+                position.stop_loss = new_stop_loss
+                updated = True
 
-        # ✅ un commit solo a fine giro (se abbiamo aggiornato qualcosa)
-        if updated_any:
-            try:
-                db.commit()
-            except Exception:
-                db.rollback()
-                raise
+            if position.stop_loss and current_price >= position.stop_loss:
+                logger.info(f"Trailing stop triggered for {position.symbol}")
+                paper_trading_service.close_position(position.id, current_price, db)
 
-        return len(positions)
+        return updated
 
 
 # Singleton
@@ -2,26 +2,36 @@
 """WebSocket connection manager for real-time data broadcasting."""
 
 from fastapi import WebSocket
-from typing import List, Dict, Set
+from typing import List, Dict, FrozenSet, Optional
 import asyncio
 import json
+import logging
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class ConnectionManager:
     """Manages WebSocket connections and broadcasts real-time updates."""
     
     def __init__(self):
         self.active_connections: List[WebSocket] = []
-        self.subscriptions: Dict[str, Set[WebSocket]] = {}  # symbol -> set of websockets
+        # symbol -> immutable snapshot of websockets, rebuilt on (un)subscribe
+        self.subscriptions: Dict[str, FrozenSet[WebSocket]] = {}
         self._lock = asyncio.Lock()
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._reaper_interval = 30.0  # Probe idle connections every 30 seconds
     
     async def connect(self, websocket: WebSocket):
         """Accept and register a new WebSocket connection."""
         await websocket.accept()
         async with self._lock:
             self.active_connections.append(websocket)
-        print(f"[WebSocket Manager] New connection. Total: {len(self.active_connections)}")
+        
+        # Start the dead-connection reaper lazily, once a loop is running
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper_loop())
+        logger.debug("New connection. Total: %d", len(self.active_connections))
     
     async def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection and clean up subscriptions."""
@@ -30,30 +40,35 @@ class ConnectionManager:
                 self.active_connections.remove(websocket)
             
             # Remove from all subscriptions
-            for symbol in list(self.subscriptions.keys()):
-                if websocket in self.subscriptions[symbol]:
-                    self.subscriptions[symbol].remove(websocket)
-                if not self.subscriptions[symbol]:
-                    del self.subscriptions[symbol]
+            for symbol, subscribers in list(self.subscriptions.items()):
+                if websocket in subscribers:
+                    subscribers = subscribers - {websocket}
+                    if subscribers:
+                        self.subscriptions[symbol] = subscribers
+                    else:
+                        del self.subscriptions[symbol]
         
-        print(f"[WebSocket Manager] Connection closed. Total: {len(self.active_connections)}")
+        logger.debug("Connection closed. Total: %d", len(self.active_connections))
     
     async def subscribe(self, websocket: WebSocket, symbol: str):
         """Subscribe a WebSocket to updates for a specific symbol."""
         async with self._lock:
-            if symbol not in self.subscriptions:
-                self.subscriptions[symbol] = set()
-            self.subscriptions[symbol].add(websocket)
-        print(f"[WebSocket Manager] Client subscribed to {symbol}")
+            self.subscriptions[symbol] = self.subscriptions.get(symbol, frozenset()) | {
+                websocket
+            }
+        logger.debug("Client subscribed to %s", symbol)
     
     async def unsubscribe(self, websocket: WebSocket, symbol: str):
         """Unsubscribe a WebSocket from updates for a specific symbol."""
         async with self._lock:
-            if symbol in self.subscriptions and websocket in self.subscriptions[symbol]:
-                self.subscriptions[symbol].remove(websocket)
-                if not self.subscriptions[symbol]:
+            subscribers = self.subscriptions.get(symbol)
+            if subscribers and websocket in subscribers:
+                subscribers = subscribers - {websocket}
+                if subscribers:
+                    self.subscriptions[symbol] = subscribers
+                else:
                     del self.subscriptions[symbol]
-        print(f"[WebSocket Manager] Client unsubscribed from {symbol}")
+        logger.debug("Client unsubscribed from %s", symbol)
     
     async def broadcast_to_all(self, message: Dict):
         """Broadcast a message to all connected clients."""
@@ -65,7 +80,7 @@ class ConnectionManager:
             try:
                 await connection.send_json(message)
             except Exception as e:
-                print(f"[WebSocket Manager] Error broadcasting: {e}")
+                logger.warning("Error broadcasting: %s", e)
                 disconnected.append(connection)
         
         # Clean up disconnected clients
@@ -74,9 +89,8 @@ class ConnectionManager:
     
     async def broadcast_to_symbol(self, symbol: str, message: Dict):
         """Broadcast a message to all clients subscribed to a symbol."""
-        async with self._lock:
-            subscribers = self.subscriptions.get(symbol, set()).copy()
-        
+        # Lock-free: the snapshot is immutable and only replaced on (un)subscribe
+        subscribers = self.subscriptions.get(symbol)
         if not subscribers:
             return
         
@@ -85,19 +99,49 @@ class ConnectionManager:
             try:
                 await connection.send_json(message)
             except Exception as e:
-                print(f"[WebSocket Manager] Error broadcasting to {symbol}: {e}")
+                logger.warning("Error broadcasting to %s: %s", symbol, e)
                 disconnected.append(connection)
         
         # Clean up disconnected clients
         for conn in disconnected:
             await self.disconnect(conn)
     
+    async def _ping(self, websocket: WebSocket):
+        """Send a lightweight heartbeat frame to a single client."""
+        await websocket.send_json({"type": "PING", "timestamp": datetime.now().isoformat()})
+    
+    async def _reaper_loop(self):
+        """Periodically probe every connection and drop the ones that fail."""
+        while True:
+            await asyncio.sleep(self._reaper_interval)
+            
+            connections = list(self.active_connections)
+            if not connections:
+                continue
+            
+            results = await asyncio.gather(
+                *(self._ping(conn) for conn in connections), return_exceptions=True
+            )
+            for conn, result in zip(connections, results):
+                if isinstance(result, Exception):
+                    await self.disconnect(conn)
+    
+    async def close(self):
+        """Stop the background reaper task."""
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+    
     async def send_to_client(self, websocket: WebSocket, message: Dict):
         """Send a message to a specific client."""
         try:
             await websocket.send_json(message)
         except Exception as e:
-            print(f"[WebSocket Manager] Error sending to client: {e}")
+            logger.warning("Error sending to client: %s", e)
             await self.disconnect(websocket)
 
 
@@ -0,0 +1,33 @@
+"""Shared helpers for the test suite."""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+
+from backend.models.candlestick import Candlestick
+
+# Per-column [low, high) bounds of the random OHLCV sample data
+_OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+_OHLCV_LOW = [100, 110, 90, 100, 1000]
+_OHLCV_HIGH = [110, 120, 100, 110, 10000]
+
+
+def bulk_candles(conn, rows):
+    """Insert candle dicts with a single executemany on the given connection.
+
+    The candlesticks table lives on models.base.Base; conftest's session setup
+    creates it on the TESTING engine alongside the lib.database tables.
+    """
+    if not rows:
+        return
+    conn.execute(insert(Candlestick), rows)
+
+
+def sample_ohlcv(n_samples, seed=42):
+    """Random OHLCV DataFrame built from a single (n_samples, 5) uniform draw."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        rng.uniform(low=_OHLCV_LOW, high=_OHLCV_HIGH, size=(n_samples, 5)),
+        columns=_OHLCV_COLUMNS,
+        copy=False,
+    )
@@ -16,3 +16,12 @@ def test_root_endpoint(client):
     assert data["status"] == "online"
     assert data["version"] == "2.0.0"
     assert data["realtime"] is True
+
+
+def test_startup_leaves_services_untouched(client):
+    """Under TESTING the shared client's startup does not rewire the singletons"""
+    from backend.services.order_monitoring_service import order_monitoring_service
+    from backend.services.paper_trading_service import paper_trading_service
+
+    assert paper_trading_service.use_database is False
+    assert order_monitoring_service._websocket_manager is None
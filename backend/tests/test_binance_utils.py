@@ -0,0 +1,110 @@
+"""Tests for the cached Binance exchangeInfo symbol lookup."""
+
+import gzip
+import io
+import json
+
+import pytest
+from unittest.mock import MagicMock, patch
+from urllib3.response import HTTPResponse
+
+import backend.utils.binance as binance
+
+
+def _response(status_code=200, symbols=(), etag=None):
+    """Fake requests response, usable as a context manager."""
+    resp = MagicMock()
+    resp.__enter__.return_value = resp
+    resp.status_code = status_code
+    resp.headers = {"ETag": etag} if etag else {}
+    resp.json.return_value = {"symbols": [{"symbol": s} for s in symbols]}
+    return resp
+
+
+@pytest.fixture
+def clock():
+    """Controllable time.monotonic for the binance module only."""
+    with patch.object(binance, "time") as fake_time:
+        fake_time.monotonic.return_value = 1000.0
+        yield fake_time.monotonic
+
+
+@pytest.fixture
+def session_get(monkeypatch):
+    """Empty symbol cache and a mocked _SESSION.get (JSON path, no ijson)."""
+    monkeypatch.setattr(binance, "_SYMBOL_CACHE", None)
+    monkeypatch.setattr(binance, "IJSON_AVAILABLE", False)
+    with patch.object(binance._SESSION, "get") as get:
+        yield get
+
+
+def test_cache_hit_within_ttl_makes_no_request(clock, session_get):
+    """A second lookup before the TTL expires is served from the cache."""
+    session_get.return_value = _response(symbols=["BTCUSDT"], etag='"v1"')
+
+    assert binance.is_symbol_on_binance("BTCUSDT") is True
+    clock.return_value += binance._TTL - 1
+    assert binance.is_symbol_on_binance("ETHUSDT") is False
+
+    session_get.assert_called_once()
+
+
+def test_not_modified_keeps_symbols_and_restarts_ttl(clock, session_get):
+    """After expiry a 304 keeps the cached set and renews its timestamp."""
+    session_get.return_value = _response(symbols=["BTCUSDT"], etag='"v1"')
+    assert binance.is_symbol_on_binance("BTCUSDT") is True
+
+    clock.return_value += binance._TTL + 1
+    session_get.return_value = _response(status_code=304)
+    assert binance.is_symbol_on_binance("BTCUSDT") is True
+    assert session_get.call_count == 2
+    assert session_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    # TTL restarted at the 304: still fresh just before the new expiry
+    clock.return_value += binance._TTL - 1
+    assert binance.is_symbol_on_binance("BTCUSDT") is True
+    assert session_get.call_count == 2
+
+
+def test_modified_replaces_symbols_and_etag(clock, session_get):
+    """After expiry a 200 swaps in the new symbol set and ETag."""
+    session_get.return_value = _response(symbols=["BTCUSDT"], etag='"v1"')
+    assert binance.is_symbol_on_binance("BTCUSDT") is True
+
+    clock.return_value += binance._TTL + 1
+    session_get.return_value = _response(symbols=["ETHUSDT"], etag='"v2"')
+    assert binance.is_symbol_on_binance("BTCUSDT") is False
+    assert binance.is_symbol_on_binance("ETHUSDT") is True
+
+    symbols, etag, _ = binance._SYMBOL_CACHE
+    assert symbols == frozenset({"ETHUSDT"})
+    assert etag == '"v2"'
+    assert session_get.call_count == 2
+
+
+@pytest.mark.parametrize("symbol", ["btc-usdt", "BTC", "BTC USDT", ""])
+def test_malformed_symbol_makes_no_request(session_get, symbol):
+    """Malformed symbols are rejected before the cache or network is touched."""
+    assert binance.is_symbol_on_binance(symbol) is False
+    session_get.assert_not_called()
+
+
+def test_streamed_gzip_body_is_parsed_with_ijson(clock, session_get, monkeypatch):
+    """With ijson installed, symbol names are streamed from the gzip raw body."""
+    pytest.importorskip("ijson")
+    monkeypatch.setattr(binance, "IJSON_AVAILABLE", True)
+
+    body = {"timezone": "UTC", "symbols": [{"symbol": "BTCUSDT"}, {"symbol": "ETHBTC"}]}
+    resp = _response(etag='"v1"')
+    resp.raw = HTTPResponse(
+        body=io.BytesIO(gzip.compress(json.dumps(body).encode())),
+        headers={"Content-Encoding": "gzip"},
+        preload_content=False,
+        decode_content=False,
+    )
+    session_get.return_value = resp
+
+    assert binance.is_symbol_on_binance("ETHBTC") is True
+    assert binance._SYMBOL_CACHE[0] == frozenset({"BTCUSDT", "ETHBTC"})
+    assert session_get.call_args.kwargs["stream"] is True
+    resp.json.assert_not_called()
@@ -1,18 +1,21 @@
 """Tests for klines range endpoint and DB-first backtest."""
 
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
-from datetime import datetime, timezone
-from main import app
+from datetime import datetime, timedelta, timezone
 
-client = TestClient(app)
+# Hourly timestamps for the 100-candle backtest series, formatted once at import
+_EXTENDED_TIMESTAMPS = tuple(
+    (datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i)).strftime(
+        "%Y-%m-%dT%H:00:00Z"
+    )
+    for i in range(100)
+)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_db_range_data():
-    """Mock DB range query response."""
-    return [
+    """Mock DB range query response (read-only, shared by the module)."""
+    return (
         {
             "timestamp": "2024-01-01T00:00:00Z",
             "open": 42000.0,
@@ -37,11 +40,27 @@ def mock_db_range_data():
             "close": 42900.0,
             "volume": 200.7,
         },
-    ]
+    )
+
 
+@pytest.fixture(scope="module")
+def extended_klines_data():
+    """100 hourly candles for backtest tests, built once per module."""
+    base_price = 42000.0
+    return tuple(
+        {
+            "timestamp": timestamp,
+            "open": base_price + i * 10,
+            "high": base_price + i * 10 + 100,
+            "low": base_price + i * 10 - 50,
+            "close": base_price + i * 10 + 50,
+            "volume": 100.0 + i,
+        }
+        for i, timestamp in enumerate(_EXTENDED_TIMESTAMPS)
+    )
 
-@patch("api.market._fetch_klines_from_db_range")
-def test_klines_range_from_db(mock_fetch_range, mock_db_range_data):
+
+def test_klines_range_from_db(mock_fetch_range, mock_db_range_data, client):
     """Test klines range endpoint returns data from DB."""
     mock_fetch_range.return_value = mock_db_range_data
 
@@ -58,14 +77,12 @@ def test_klines_range_from_db(mock_fetch_range, mock_db_range_data):
     mock_fetch_range.assert_called_once()
 
 
-@patch("api.market._fetch_klines_from_db_range")
-@patch("services.binance_service.binance_service.get_klines_data")
 def test_klines_range_fallback_to_binance(
-    mock_binance, mock_fetch_range, mock_db_range_data
+    mock_binance_klines, mock_fetch_range, mock_db_range_data, client
 ):
     """Test klines range endpoint falls back to Binance when DB is empty."""
     mock_fetch_range.return_value = []  # Empty DB
-    mock_binance.return_value = mock_db_range_data
+    mock_binance_klines.return_value = mock_db_range_data
 
     response = client.get(
         "/api/klines/range?symbol=BTCEUR&timeframe=1h&start=2024-01-01T00:00:00Z&end=2024-01-01T23:59:59Z"
@@ -76,10 +93,10 @@ def test_klines_range_fallback_to_binance(
     assert data["success"] is True
     assert len(data["data"]) == 3
     mock_fetch_range.assert_called_once()
-    mock_binance.assert_called_once()
+    mock_binance_klines.assert_called_once()
 
 
-def test_klines_range_missing_params():
+def test_klines_range_missing_params(client):
     """Test klines range endpoint with missing parameters."""
     # Missing start
     response = client.get(
@@ -94,7 +111,7 @@ def test_klines_range_missing_params():
     assert response.status_code == 422
 
 
-def test_klines_range_invalid_date():
+def test_klines_range_invalid_date(client):
     """Test klines range endpoint with invalid date format."""
     response = client.get(
         "/api/klines/range?symbol=BTCEUR&timeframe=1h&start=invalid-date&end=2024-01-01T23:59:59Z"
@@ -102,25 +119,11 @@ def test_klines_range_invalid_date():
     assert response.status_code == 400
 
 
-@patch("api.market._fetch_klines_from_db_range")
-def test_backtest_with_date_range_uses_db(mock_fetch_range, mock_db_range_data):
+def test_backtest_with_date_range_uses_db(
+    mock_fetch_range, extended_klines_data, client
+):
     """Test backtest endpoint uses DB-first range query when dates provided."""
-    # Create more data for backtesting
-    extended_data = []
-    base_price = 42000.0
-    for i in range(100):
-        extended_data.append(
-            {
-                "timestamp": f"2024-01-{1 + i // 24:02d}T{i % 24:02d}:00:00Z",
-                "open": base_price + i * 10,
-                "high": base_price + i * 10 + 100,
-                "low": base_price + i * 10 - 50,
-                "close": base_price + i * 10 + 50,
-                "volume": 100.0 + i,
-            }
-        )
-
-    mock_fetch_range.return_value = extended_data
+    mock_fetch_range.return_value = extended_klines_data
 
     backtest_config = {
         "symbol": "BTCEUR",
@@ -146,24 +149,11 @@ def test_backtest_with_date_range_uses_db(mock_fetch_range, mock_db_range_data):
     mock_fetch_range.assert_called_once()
 
 
-@patch("api.market._fetch_klines_from_db")
-def test_backtest_without_date_range_uses_limit(mock_fetch_limit):
+def test_backtest_without_date_range_uses_limit(
+    mock_fetch_limit, extended_klines_data, client
+):
     """Test backtest endpoint uses limit-based query when no dates provided."""
-    extended_data = []
-    base_price = 42000.0
-    for i in range(100):
-        extended_data.append(
-            {
-                "timestamp": f"2024-01-{1 + i // 24:02d}T{i % 24:02d}:00:00Z",
-                "open": base_price + i * 10,
-                "high": base_price + i * 10 + 100,
-                "low": base_price + i * 10 - 50,
-                "close": base_price + i * 10 + 50,
-                "volume": 100.0 + i,
-            }
-        )
-
-    mock_fetch_limit.return_value = extended_data
+    mock_fetch_limit.return_value = extended_klines_data
 
     backtest_config = {
         "symbol": "BTCEUR",
@@ -7,26 +7,39 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.api.ml import router
+from backend.app.ml.config import ml_config
+from backend.app.ml.features.market_features import MarketFeatureExtractor
+from backend.app.ml.features.pattern_features import PatternFeatureExtractor
+from backend.app.ml.features.technical_features import TechnicalFeatureExtractor
+from backend.app.ml.utils.preprocessing import DataPreprocessor, normalize_ohlcv
+from backend.services.ml_service import ml_service
+from tests._helpers import sample_ohlcv
+
+
+def _subdirs(path):
+    """Names of the directories directly under ``path`` (empty if missing)."""
+    if not os.path.isdir(path):
+        return set()
+    with os.scandir(path) as entries:
+        return {entry.name for entry in entries if entry.is_dir()}
+
 
 def test_directory_structure():
     """Test that ML directory structure is created."""
-    import os
-
     # Backend directories
-    assert os.path.exists("app/ml"), "app/ml directory not found"
-    assert os.path.exists("app/ml/features"), "app/ml/features directory not found"
-    assert os.path.exists("app/ml/models"), "app/ml/models directory not found"
-    assert os.path.exists("app/ml/inference"), "app/ml/inference directory not found"
-    assert os.path.exists("app/ml/utils"), "app/ml/utils directory not found"
+    expected = {"features", "models", "inference", "utils"}
+    missing = expected - _subdirs("app/ml")
+    assert not missing, f"app/ml subdirectories not found: {sorted(missing)}"
 
     # Infrastructure directories
-    assert os.path.exists(
-        "../infrastructure/ml/model_storage"
-    ), "model_storage directory not found"
-    assert os.path.exists(
-        "../infrastructure/ml/training_data"
-    ), "training_data directory not found"
-    assert os.path.exists("../infrastructure/ml/mlflow"), "mlflow directory not found"
+    expected = {"model_storage", "training_data", "mlflow"}
+    missing = expected - _subdirs("../infrastructure/ml")
+    assert not missing, f"infrastructure/ml directories not found: {sorted(missing)}"
 
     print("✅ Directory structure test passed")
 
@@ -58,39 +71,24 @@ def test_imports():
 
 def test_feature_extraction():
     """Test feature extraction on sample data."""
-    import pandas as pd
-    import numpy as np
-    from backend.app.ml.features.technical_features import TechnicalFeatureExtractor
-    from backend.app.ml.features.pattern_features import PatternFeatureExtractor
-    from backend.app.ml.features.market_features import MarketFeatureExtractor
-
     # Create sample OHLCV data
-    np.random.seed(42)
-    n_samples = 300
-
-    df = pd.DataFrame(
-        {
-            "open": np.random.uniform(100, 110, n_samples),
-            "high": np.random.uniform(110, 120, n_samples),
-            "low": np.random.uniform(90, 100, n_samples),
-            "close": np.random.uniform(100, 110, n_samples),
-            "volume": np.random.uniform(1000, 10000, n_samples),
-        }
-    )
+    df = sample_ohlcv(300)
+
+    # Extractors copy their input, so the same frame is shared by all three
 
     # Test technical features
     tech_extractor = TechnicalFeatureExtractor()
-    df_tech = tech_extractor.extract(df.copy())
+    df_tech = tech_extractor.extract(df)
     assert len(df_tech.columns) > len(df.columns), "Technical features not extracted"
 
     # Test pattern features
     pattern_extractor = PatternFeatureExtractor()
-    df_pattern = pattern_extractor.extract(df.copy())
+    df_pattern = pattern_extractor.extract(df)
     assert len(df_pattern.columns) > len(df.columns), "Pattern features not extracted"
 
     # Test market features
     market_extractor = MarketFeatureExtractor()
-    df_market = market_extractor.extract(df.copy())
+    df_market = market_extractor.extract(df)
     assert len(df_market.columns) > len(df.columns), "Market features not extracted"
 
     print("✅ Feature extraction test passed")
@@ -98,8 +96,6 @@ def test_feature_extraction():
 
 def test_ml_config():
     """Test ML configuration."""
-    from backend.app.ml.config import ml_config
-
     assert ml_config.PATTERN_SEQUENCE_LENGTH == 20, "Wrong pattern sequence length"
     assert ml_config.PATTERN_NUM_CLASSES == 15, "Wrong number of pattern classes"
     assert ml_config.PREDICTION_HORIZONS == [1, 5, 15, 60], "Wrong prediction horizons"
@@ -110,8 +106,6 @@ def test_ml_config():
 
 def test_api_endpoints():
     """Test that API endpoints are registered."""
-    from backend.api.ml import router
-
     routes = [route.path for route in router.routes if hasattr(route, "path")]
 
     assert "/ml/insights/{symbol}" in routes, "Insights endpoint not found"
@@ -127,8 +121,6 @@ def test_api_endpoints():
 
 def test_ml_service():
     """Test ML service functionality."""
-    from backend.services.ml_service import ml_service
-
     # Test model status
     status = ml_service.get_model_status()
     assert "pattern_cnn_loaded" in status, "Pattern CNN status not in response"
@@ -143,10 +135,6 @@ def test_ml_service():
 
 def test_preprocessing_utils():
     """Test preprocessing utilities."""
-    import numpy as np
-    import pandas as pd
-    from backend.app.ml.utils.preprocessing import DataPreprocessor, normalize_ohlcv
-
     preprocessor = DataPreprocessor()
 
     # Test data cleaning
@@ -170,6 +158,42 @@ def test_preprocessing_utils():
     print("✅ Preprocessing utilities test passed")
 
 
+def test_normalize_ohlcv_inplace():
+    """normalize_ohlcv(a, out=a) matches the allocating call."""
+    ohlcv = np.array(
+        [
+            [100, 110, 90, 105, 1000],
+            [105, 115, 95, 110, 1200],
+            [110, 120, 100, 115, 1500],
+        ],
+        dtype=np.float64,
+    )
+    expected = normalize_ohlcv(ohlcv)
+
+    result = normalize_ohlcv(ohlcv, out=ohlcv)
+
+    assert result is ohlcv, "out= array not returned"
+    assert np.allclose(ohlcv, expected), "In-place normalization differs"
+
+
+def test_normalize_ohlcv_integer_input():
+    """Integer OHLCV is normalized into a float result, not truncated."""
+    ohlcv = np.array(
+        [
+            [100, 110, 90, 105, 1000],
+            [105, 115, 95, 110, 1200],
+            [110, 120, 100, 115, 1500],
+        ]
+    )
+    normalized = normalize_ohlcv(ohlcv)
+
+    assert np.issubdtype(normalized.dtype, np.floating)
+    assert np.allclose(normalized, normalize_ohlcv(ohlcv.astype(np.float64)))
+
+    with pytest.raises(TypeError):
+        normalize_ohlcv(ohlcv, out=ohlcv)
+
+
 if __name__ == "__main__":
     print("Testing ML Infrastructure Implementation...\n")
 
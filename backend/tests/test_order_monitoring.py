@@ -5,6 +5,8 @@ Tests for order monitoring service
 import sys
 import os
 
+import pytest
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from backend.services.advanced_orders_service import (
@@ -13,12 +15,25 @@ from backend.services.advanced_orders_service import (
 )
 from backend.services.order_monitoring_service import order_monitoring_service
 
+# Order books kept by the advanced_orders_service singleton
+_ORDER_BOOKS = (
+    "oco_orders",
+    "bracket_orders",
+    "trailing_stop_orders",
+    "iceberg_orders",
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_orders(monkeypatch):
+    """Give each test empty order books and no broadcaster; restored afterwards."""
+    for name in _ORDER_BOOKS:
+        monkeypatch.setattr(advanced_orders_service, name, {})
+    monkeypatch.setattr(order_monitoring_service, "_websocket_manager", None)
+
 
 def test_oco_order_monitoring():
     """Test OCO order monitoring and execution."""
-    # Clear existing orders
-    advanced_orders_service.oco_orders.clear()
-
     # Create OCO order with buy-stop above and sell-limit below
     order = advanced_orders_service.create_oco_order(
         symbol="BTCUSDT",
@@ -47,9 +62,6 @@ def test_oco_order_monitoring():
 
 def test_bracket_order_monitoring():
     """Test Bracket order monitoring and coordination."""
-    # Clear existing orders
-    advanced_orders_service.bracket_orders.clear()
-
     # Create bracket order with market entry
     order = advanced_orders_service.create_bracket_order(
         symbol="ETHUSDT",
@@ -78,9 +90,6 @@ def test_bracket_order_monitoring():
 
 def test_trailing_stop_activation():
     """Test trailing stop activation and price updates."""
-    # Clear existing orders
-    advanced_orders_service.trailing_stop_orders.clear()
-
     # Create trailing stop with activation price
     order = advanced_orders_service.create_trailing_stop_order(
         symbol="BTCUSDT",
@@ -111,9 +120,6 @@ def test_trailing_stop_activation():
 
 def test_iceberg_slice_execution():
     """Test iceberg order slice execution."""
-    # Clear existing orders
-    advanced_orders_service.iceberg_orders.clear()
-
     # Create iceberg order
     order = advanced_orders_service.create_iceberg_order(
         symbol="BTCUSDT",
@@ -142,16 +148,4 @@ def test_iceberg_slice_execution():
 
 
 if __name__ == "__main__":
-    print("Testing OCO order monitoring...")
-    test_oco_order_monitoring()
-
-    print("Testing Bracket order monitoring...")
-    test_bracket_order_monitoring()
-
-    print("Testing Trailing stop activation...")
-    test_trailing_stop_activation()
-
-    print("Testing Iceberg slice execution...")
-    test_iceberg_slice_execution()
-
-    print("\n✅ All monitoring tests passed!")
+    pytest.main([__file__, "-v"])
@@ -1,9 +1,5 @@
 """Tests for paper trading database integration."""
 
-import pytest
-import os
-from sqlalchemy.orm import Session
-
 
 def test_paper_trading_in_memory_mode():
     """Test paper trading service in in-memory mode."""
@@ -23,56 +19,43 @@ def test_paper_trading_in_memory_mode():
     assert positions[0]["symbol"] == "BTCUSDT"
 
 
-def test_paper_trading_db_mode():
+def test_paper_trading_db_mode(db):
     """Test paper trading service with database."""
-    os.environ["DATABASE_URL"] = "sqlite:///:memory:"
-
-    from backend.lib.database import init_database, create_tables, get_db
     from backend.services.paper_trading_service import PaperTradingService
 
-    if not init_database():
-        pytest.skip("Database initialization failed")
-
-    create_tables()
     service = PaperTradingService()
     service.set_database(True)
 
-    with get_db() as db:
-        # Create order
-        result = service.create_order("buy", "BTCUSDT", 1.0, 50000.0, db=db)
-        position_id = result["orderId"]
-        assert result["symbol"] == "BTCUSDT"
-
-    with get_db() as db:
-        # Get positions
-        positions = service.get_positions(db=db)
-        assert len(positions) == 1
-        assert positions[0]["symbol"] == "BTCUSDT"
-
-    with get_db() as db:
-        # Update position
-        update_result = service.update_position(
-            position_id=position_id, stop_loss=48000.0, take_profit=52000.0, db=db
-        )
-        assert update_result is not None
-        assert update_result["stop_loss"] == 48000.0
-        assert update_result["take_profit"] == 52000.0
-
-    with get_db() as db:
-        # Verify update persisted
-        positions = service.get_positions(db=db)
-        assert positions[0]["stop_loss"] == 48000.0
-
-    with get_db() as db:
-        # Close position
-        close_result = service.close_position(position_id, 51000.0, db=db)
-        assert close_result is not None
-        assert close_result["realized_pnl"] == 1000.0
-
-    with get_db() as db:
-        # Verify closed
-        positions = service.get_positions(db=db)
-        assert len(positions) == 0
+    # Create order
+    result = service.create_order("buy", "BTCUSDT", 1.0, 50000.0, db=db)
+    position_id = result["orderId"]
+    assert result["symbol"] == "BTCUSDT"
+
+    # Get positions
+    positions = service.get_positions(db=db)
+    assert len(positions) == 1
+    assert positions[0]["symbol"] == "BTCUSDT"
+
+    # Update position
+    update_result = service.update_position(
+        position_id=position_id, stop_loss=48000.0, take_profit=52000.0, db=db
+    )
+    assert update_result is not None
+    assert update_result["stop_loss"] == 48000.0
+    assert update_result["take_profit"] == 52000.0
+
+    # Verify update persisted
+    positions = service.get_positions(db=db)
+    assert positions[0]["stop_loss"] == 48000.0
+
+    # Close position
+    close_result = service.close_position(position_id, 51000.0, db=db)
+    assert close_result is not None
+    assert close_result["realized_pnl"] == 1000.0
+
+    # Verify closed
+    positions = service.get_positions(db=db)
+    assert len(positions) == 0
 
 
 def test_database_fallback():
@@ -8,8 +8,33 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-import pandas as pd
-import numpy as np
+import importlib.util
+import py_compile
+import re
+
+from tests._helpers import sample_ohlcv
+
+_PIPELINE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "app",
+    "ml",
+    "training",
+    "pipeline.py",
+)
+
+# Strings the pipeline.py fixes removed: spaced import, old extractor method
+# names, and stray spaces after "." in attribute access / format specs
+_FORBIDDEN_STRINGS = (
+    "from backend.app.ml. config",
+    "pattern_extractor.extract_candlestick_features",
+    "market_extractor.extract_features",
+    ". extract_features",
+    ". copy()",
+    ". iloc",
+    ". append",
+    ":. ",
+)
+_FORBIDDEN = re.compile("|".join(map(re.escape, _FORBIDDEN_STRINGS)))
 
 
 def test_pipeline_imports():
@@ -33,7 +58,7 @@ def test_pipeline_imports():
         return False
 
 
-def test_feature_extractor_methods():
+def test_feature_extractor_methods(sample_ohlcv_df):
     """Test that all feature extractors have correct extract() method."""
     try:
         from backend.app.ml.features.technical_features import TechnicalFeatureExtractor
@@ -57,20 +82,10 @@ def test_feature_extractor_methods():
 
         print("✅ All feature extractors have extract() method")
 
-        # Create sample data
-        np.random.seed(42)
-        df = pd.DataFrame(
-            {
-                "open": np.random.uniform(100, 110, 100),
-                "high": np.random.uniform(110, 120, 100),
-                "low": np.random.uniform(90, 100, 100),
-                "close": np.random.uniform(100, 110, 100),
-                "volume": np.random.uniform(1000, 10000, 100),
-            }
-        )
+        df = sample_ohlcv_df
 
-        # Test that extract() methods work
-        df_tech = tech.extract(df.copy())
+        # Test that extract() methods work (they copy their input)
+        df_tech = tech.extract(df)
         assert len(df_tech.columns) > len(
             df.columns
         ), "Technical features not extracted"
@@ -78,7 +93,7 @@ def test_feature_extractor_methods():
             f"✅ TechnicalFeatureExtractor.extract() works - added {len(df_tech.columns) - len(df.columns)} features"
         )
 
-        df_pattern = pattern.extract(df.copy())
+        df_pattern = pattern.extract(df)
         assert len(df_pattern.columns) > len(
             df.columns
         ), "Pattern features not extracted"
@@ -86,7 +101,7 @@ def test_feature_extractor_methods():
             f"✅ PatternFeatureExtractor.extract() works - added {len(df_pattern.columns) - len(df.columns)} features"
         )
 
-        df_market = market.extract(df.copy())
+        df_market = market.extract(df)
         assert len(df_market.columns) > len(df.columns), "Market features not extracted"
         print(
             f"✅ MarketFeatureExtractor.extract() works - added {len(df_market.columns) - len(df.columns)} features"
@@ -104,16 +119,13 @@ def test_feature_extractor_methods():
 def test_pipeline_syntax():
     """Test that pipeline.py has no syntax errors."""
     try:
-        import py_compile
-
-        pipeline_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "app",
-            "ml",
-            "training",
-            "pipeline.py",
-        )
-        py_compile.compile(pipeline_path, doraise=True)
+        # A __pycache__ entry newer than the source already proves it compiles
+        cache = importlib.util.cache_from_source(_PIPELINE_PATH)
+        if not (
+            os.path.exists(cache)
+            and os.path.getmtime(cache) >= os.path.getmtime(_PIPELINE_PATH)
+        ):
+            py_compile.compile(_PIPELINE_PATH, doraise=True)
         print("✅ pipeline.py compiles without syntax errors")
         return True
     except Exception as e:
@@ -156,45 +168,20 @@ def test_pipeline_instantiation():
 def test_no_spacing_errors():
     """Verify that spacing errors have been fixed in the file."""
     try:
-        pipeline_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "app",
-            "ml",
-            "training",
-            "pipeline.py",
-        )
-        with open(pipeline_path, "r") as f:
+        with open(_PIPELINE_PATH, "r") as f:
             content = f.read()
 
         # Check for the fixed import
         assert (
             "from backend.app.ml.config import ml_config" in content
         ), "Import not fixed"
-        assert (
-            "from backend.app.ml. config" not in content
-        ), "Old import with space still exists"
-        print("✅ Import statement spacing fixed")
 
-        # Check that old method names are replaced
-        # TechnicalFeatureExtractor has both extract() and extract_features(), we use extract_features()
-        # to keep feature_columns updated
-        assert (
-            "pattern_extractor.extract_candlestick_features" not in content
-        ), "Old extract_candlestick_features still exists"
-        assert (
-            "market_extractor.extract_features" not in content
-        ), "Old market_extractor.extract_features still exists"
-        print("✅ Feature extractor method calls updated correctly")
-
-        # Check for double spaces in specific patterns that were fixed
-        assert (
-            ". extract_features" not in content
-        ), "Spacing error before extract_features"
-        assert ". copy()" not in content, "Spacing error before copy()"
-        assert ". iloc" not in content, "Spacing error before iloc"
-        assert ". append" not in content, "Spacing error before append"
-        assert ":. " not in content, "Spacing error in format strings"
-        print("✅ Variable reference spacing errors fixed")
+        # Old import/method names and spacing errors, found in a single pass.
+        # TechnicalFeatureExtractor has both extract() and extract_features(),
+        # we use extract_features() to keep feature_columns updated
+        match = _FORBIDDEN.search(content)
+        assert match is None, f"Unfixed pattern still present: {match.group(0)!r}"
+        print("✅ Import, method call and spacing fixes verified")
 
         return True
     except AssertionError as e:
@@ -225,7 +212,7 @@ if __name__ == "__main__":
 
     print("Test 3: Feature Extractor Methods")
     print("-" * 40)
-    results.append(test_feature_extractor_methods())
+    results.append(test_feature_extractor_methods(sample_ohlcv(100)))
     print()
 
     print("Test 4: Spacing Errors Fixed")
@@ -1,16 +1,26 @@
 import pytest
-from fastapi.testclient import TestClient
-from main import app
 
-client = TestClient(app)
+# Accepted /api/system/info database fields
+_DB_STATUSES = frozenset({"connected", "error"})
+_DB_TYPES = frozenset({"PostgreSQL", "In-Memory"})
 
 
-def test_system_info_endpoint():
-    """Test /api/system/info endpoint"""
+def _db(data):
+    """The "database" section of a system info payload."""
+    return data["database"]
+
+
+@pytest.fixture(scope="module")
+def system_info(client):
+    """/api/system/info payload, fetched once and shared by the shape tests"""
     response = client.get("/api/system/info")
     assert response.status_code == 200
+    return response.json()
 
-    data = response.json()
+
+def test_system_info_endpoint(system_info):
+    """Test /api/system/info endpoint"""
+    data = system_info
 
     # Verify structure
     assert "server" in data
@@ -23,6 +33,7 @@ def test_system_info_endpoint():
     # Verify server info
     assert data["server"]["version"] == "2.0.0"
     assert data["server"]["port"] == 8000
+    assert data["server"]["environment"] == "development"
     assert "started" in data["server"]
 
     # Verify trading config
@@ -30,13 +41,14 @@ def test_system_info_endpoint():
     assert data["trading"]["live_trading"] is False
     assert data["trading"]["realtime_enabled"] is True
 
-    # Verify database status (should be connected or disconnected)
-    assert data["database"]["status"] in ["connected", "disconnected", "partial", "error"]
-    assert data["database"]["type"] in ["PostgreSQL", "In-Memory", "SQLite Multi-Database", "Mixed/Error", "Partial", "Not Initialized"]
+    # Verify database status
+    database = _db(data)
+    assert database["status"] in _DB_STATUSES
+    assert database["type"] in _DB_TYPES
 
     # Verify ML features
-    assert "technical_analysis" in data["ml_features"]
-    assert "pytorch_available" in data["ml_features"]
+    assert isinstance(data["ml_features"]["technical_analysis"], bool)
+    assert isinstance(data["ml_features"]["pytorch_available"], bool)
 
     # Verify data source
     assert data["data_source"]["provider"] == "Binance Public API + WebSocket"
@@ -44,42 +56,30 @@ def test_system_info_endpoint():
 
     # Verify configuration
     assert isinstance(data["configuration"]["cors_origins"], list)
+    assert len(data["configuration"]["cors_origins"]) > 0
     assert data["configuration"]["binance_url"] == "https://api.binance.com"
 
 
-def test_system_info_database_connected():
+def test_system_info_database_connected(system_info):
     """Test system info with database connection"""
-    response = client.get("/api/system/info")
-    data = response.json()
-
-    # If database is connected, check structure
-    if data["database"]["status"] == "connected":
-        # Multi-database setup should have databases dict and urls dict
-        if "databases" in data["database"]:
-            assert isinstance(data["database"]["databases"], dict)
-            assert "trading" in data["database"]["databases"]
-            assert "market" in data["database"]["databases"]
-            assert "analytics" in data["database"]["databases"]
-            
-            assert isinstance(data["database"]["urls"], dict)
-            assert "trading" in data["database"]["urls"]
-            assert "market" in data["database"]["urls"]
-            assert "analytics" in data["database"]["urls"]
-            
-            assert data["database"]["type"] == "SQLite Multi-Database"
-        # Legacy single database setup
-        elif "url" in data["database"]:
-            assert data["database"]["url"] is not None
-            assert data["database"]["type"] in ["PostgreSQL", "SQLite"]
-
-
-def test_system_info_response_time():
-    """Test system info endpoint response time"""
-    import time
-
-    start = time.time()
-    response = client.get("/api/system/info")
-    duration = time.time() - start
+    database = _db(system_info)
+
+    # The suite runs on the in-memory SQLite engine (TESTING)
+    assert database == {
+        "status": "connected",
+        "type": "In-Memory",
+        "url": "sqlite://",
+    }
+
+
+@pytest.mark.benchmark(group="system")
+def test_system_info_response_time(benchmark, client):
+    """Benchmark system info endpoint response time
+
+    Regular runs (CI included) call the endpoint once, untimed
+    (--benchmark-disable in pytest.ini); time it locally with
+    --benchmark-enable, see DATABASE.md.
+    """
+    response = benchmark(client.get, "/api/system/info")
 
     assert response.status_code == 200
-    assert duration < 1.0  # Should respond in less than 1 second
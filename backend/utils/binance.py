@@ -1,11 +1,99 @@
+import re
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
 import requests
 
+# Opzionale: parse in streaming di exchangeInfo, senza costruire tutto l'albero JSON
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
+EXCHANGE_INFO_URL = "https://api.binance.com/api/v3/exchangeInfo"
+
+# Formato dei simboli Binance (es. BTCUSDT): scarta input malformati senza rete
+_VALID_SYMBOL = re.compile(r"[A-Z0-9]{5,20}")
+
+# exchangeInfo è un payload di diversi MB: lo scarichiamo al massimo ogni _TTL
+# secondi e teniamo solo i nomi dei simboli (frozenset, lookup O(1))
+_TTL = 600
+# (simboli, ETag, timestamp): alla scadenza il refresh è un GET condizionale,
+# un 304 rinnova il TTL senza riscaricare il body
+_SYMBOL_CACHE: Optional[Tuple[FrozenSet[str], Optional[str], float]] = None
+_SYMBOL_LOCK = threading.Lock()
+
+# Keep-alive: riusa la connessione TLS tra un refresh e l'altro
+_SESSION = requests.Session()
+
+
+def _cached_symbols() -> Optional[FrozenSet[str]]:
+    cache = _SYMBOL_CACHE
+    if cache is not None and time.monotonic() - cache[2] < _TTL:
+        return cache[0]
+    return None
+
+
+def _revalidation_headers() -> Dict[str, str]:
+    cache = _SYMBOL_CACHE
+    if cache is not None and cache[1]:
+        return {"If-None-Match": cache[1]}
+    return {}
+
+
+def _store_symbols(names: Iterable[str], etag: Optional[str]) -> FrozenSet[str]:
+    global _SYMBOL_CACHE
+    symbols = frozenset(names)
+    _SYMBOL_CACHE = (symbols, etag, time.monotonic())
+    return symbols
+
+
+def _renew_symbols() -> FrozenSet[str]:
+    """304 Not Modified: keep the cached symbols and restart the TTL."""
+    global _SYMBOL_CACHE
+    symbols, etag, _ = _SYMBOL_CACHE
+    _SYMBOL_CACHE = (symbols, etag, time.monotonic())
+    return symbols
+
+
+def _get_binance_symbols() -> FrozenSet[str]:
+    symbols = _cached_symbols()
+    if symbols is not None:
+        return symbols
+    # Single-flight: i chiamanti concorrenti aspettano un'unica richiesta HTTP
+    with _SYMBOL_LOCK:
+        symbols = _cached_symbols()
+        if symbols is not None:
+            return symbols
+        with _SESSION.get(
+            EXCHANGE_INFO_URL,
+            headers=_revalidation_headers(),
+            timeout=5,
+            stream=IJSON_AVAILABLE,
+        ) as resp:
+            if resp.status_code == 304:
+                return _renew_symbols()
+            resp.raise_for_status()
+            etag = resp.headers.get("ETag")
+            if IJSON_AVAILABLE:
+                # Legge solo i nomi dei simboli dal body (gzip decodificato)
+                resp.raw.decode_content = True
+                names = ijson.items(resp.raw, "symbols.item.symbol")
+                return _store_symbols(names, etag)
+            names = (s["symbol"] for s in resp.json()["symbols"])
+            return _store_symbols(names, etag)
+
+
 def is_symbol_on_binance(symbol: str) -> bool:
-    url = "https://api.binance.com/api/v3/exchangeInfo"
+    symbol = symbol.upper()
+    if not _VALID_SYMBOL.fullmatch(symbol):
+        return False
     try:
-        resp = requests.get(url, timeout=5)
-        resp.raise_for_status()
-        symbols = [s["symbol"] for s in resp.json()["symbols"]]
-        return symbol.upper() in symbols
+        return symbol in _get_binance_symbols()
     except Exception:
-        return False
\ No newline at end of file
+        return False
+